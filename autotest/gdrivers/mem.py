@@ -37,60 +37,67 @@ import pytest
 
 from osgeo import gdal
 
+# Set*() methods copy their argument, so those can be shared between tests
+_CT = gdal.ColorTable()
+_CT.SetColorEntry(0, (255, 255, 255, 255))
+_RAT = gdal.RasterAttributeTable()
 
-@pytest.fixture
+
+# Rasters in this module are tiny: no need for a large block cache
+@pytest.fixture(autouse=True, scope="module")
+def module_cache_max():
+    with gdaltest.SetCacheMax(16 * 1024 * 1024):
+        yield
+
+
+@pytest.fixture(scope="module")
 @gdaltest.disable_exceptions()
 def mem_native_memory():
 
     with gdal.quiet_errors():
         ds = gdal.Open("MEM:::")
     assert ds is None, "opening MEM dataset should have failed."
-    for libname in ["msvcrt", "libc.so.6"]:
-        try:
-            crt = ctypes.CDLL(libname)
-        except OSError:
-            crt = None
-        if crt is not None:
-            break
-
-    if crt is None:
-        pytest.skip()
-
-    malloc = crt.malloc
-    malloc.argtypes = [ctypes.c_size_t]
-    malloc.restype = ctypes.c_void_p
-
-    free = crt.free
-    free.argtypes = [ctypes.c_void_p]
-    free.restype = None
 
-    # allocate band data array.
+    # allocate band data array. It is kept alive by being returned along
+    # with its address.
     width = 50
     height = 3
-    p = malloc(width * height * 4)
-    if p is None:
-        pytest.skip()
+    buf = (ctypes.c_float * (width * height))()
+
+    return ctypes.addressof(buf), width, height, buf
+
+
+@pytest.fixture(scope="module")
+def mem_drv():
+    return gdal.GetDriverByName("MEM")
+
+
+@pytest.fixture(scope="module")
+def byte_tif():
+    return gdal.Open("data/byte.tif")
 
-    return p, free, width, height
+
+@pytest.fixture(scope="module")
+def rgbsmall_tif():
+    return gdal.Open("data/rgbsmall.tif")
 
 
 ###############################################################################
 # Create a MEM dataset, and set some data, then test it.
 
 
-def test_mem_1():
+def test_mem_1(mem_drv):
 
     #######################################################
     # Setup dataset
-    drv = gdal.GetDriverByName("MEM")
-    gdaltest.mem_ds = drv.Create("mem_1.mem", 50, 3)
+    gdaltest.mem_ds = mem_drv.Create("mem_1.mem", 50, 3)
     ds = gdaltest.mem_ds
 
     assert ds.GetProjection() == "", "projection wrong"
 
     assert ds.GetGeoTransform(can_return_null=True) is None, "geotransform wrong"
 
-    raw_data = b"".join(struct.pack("f", v) for v in range(150))
+    raw_data = struct.pack("150f", *range(150))
     ds.WriteRaster(0, 0, 50, 3, raw_data, buf_type=gdal.GDT_Float32, band_list=[1])
 
     wkt = gdaltest.user_srs_to_wkt("EPSG:26711")
@@ -102,14 +109,19 @@ def test_mem_1():
     band = ds.GetRasterBand(1)
     band.SetNoDataValue(-1.0)
 
-    # Set GCPs()
+    # SetGCPs(): clear when there are none, set, clear existing ones, then
+    # set again and replace existing ones
     wkt_gcp = gdaltest.user_srs_to_wkt("EPSG:4326")
     gcps = [gdal.GCP(0, 1, 2, 3, 4)]
-    ds.SetGCPs([], "")
-    ds.SetGCPs(gcps, wkt_gcp)
-    ds.SetGCPs([], "")
-    ds.SetGCPs(gcps, wkt_gcp)
-    ds.SetGCPs(gcps, wkt_gcp)
+    for gcps_arg, wkt_arg in [
+        ([], ""),
+        (gcps, wkt_gcp),
+        ([], ""),
+        (gcps, wkt_gcp),
+        (gcps, wkt_gcp),
+    ]:
+        ds.SetGCPs(gcps_arg, wkt_arg)
+        assert ds.GetGCPCount() == len(gcps_arg)
 
     #######################################################
     # Verify dataset.
@@ -140,8 +152,7 @@ def test_mem_1():
 
 def test_mem_2(mem_native_memory):
 
-    p, free, width, height = mem_native_memory
-    float_p = ctypes.cast(p, ctypes.POINTER(ctypes.c_float))
+    p, width, height, buf = mem_native_memory
 
     # build ds name.
     dsnames = [
@@ -153,37 +164,62 @@ def test_mem_2(mem_native_memory):
 
     for dsname in dsnames:
 
-        for i in range(width * height):
-            float_p[i] = 5.0
+        buf[:] = [5.0] * (width * height)
 
         dsro = gdal.Open(dsname)
         if dsro is None:
-            free(p)
             pytest.fail("opening MEM dataset failed in read only mode.")
 
         chksum = dsro.GetRasterBand(1).Checksum()
         if chksum != 750:
             print(chksum)
-            free(p)
             pytest.fail("checksum failed.")
         dsro = None
 
         dsup = gdal.Open(dsname, gdal.GA_Update)
         if dsup is None:
-            free(p)
             pytest.fail("opening MEM dataset failed in update mode.")
 
         dsup.GetRasterBand(1).Fill(100.0)
         dsup.FlushCache()
 
-        if float_p[0] != 100.0:
-            print(float_p[0])
-            free(p)
+        if buf[0] != 100.0:
+            print(buf[0])
             pytest.fail("fill seems to have failed.")
 
         dsup = None
 
 
+###############################################################################
+# Wrap an in-memory array with AddBand(DATAPOINTER=), which does not
+# involve the MEM::: connection string parser.
+
+
+def test_mem_2_addband_datapointer(mem_native_memory, mem_drv):
+
+    p, width, height, buf = mem_native_memory
+
+    buf[:] = [5.0] * (width * height)
+
+    ds = mem_drv.Create("", width, height, 0)
+    ds.AddBand(
+        gdal.GDT_Float32,
+        options=[
+            "DATAPOINTER=0x%X" % p,
+            "PIXELOFFSET=4",
+            "LINEOFFSET=%d" % (width * 4),
+        ],
+    )
+
+    assert ds.GetRasterBand(1).Checksum() == 750
+
+    ds.GetRasterBand(1).Fill(100.0)
+    ds.FlushCache()
+
+    assert buf[0] == 100.0
+    ds = None
+
+
 @pytest.mark.parametrize(
     "ds_definition, expected_sr",
     [
@@ -204,7 +240,7 @@ def test_mem_2(mem_native_memory):
 def test_geotransform(ds_definition, expected_sr, mem_native_memory):
     """Test GEOTRANSFORM and SPATIALREFERENCE"""
 
-    p, free, width, height = mem_native_memory
+    p, width, height, _ = mem_native_memory
 
     ## more ds names, ensure GEOTRANSFORM and SPATIALREFERENCE get tested
     proj_crs = "+proj=laea +lon_0=147 +lat_0=-42"
@@ -214,23 +250,20 @@ def test_geotransform(ds_definition, expected_sr, mem_native_memory):
         ds_definition.format(datapointer=p, proj_crs=proj_crs, ll_crs=ll_crs)
     )
     if dsro is None:
-        free(p)
         pytest.fail("opening MEM dataset failed in read only mode.")
 
     assert dsro.GetGeoTransform() == (-1e06, 1953.125, 0, 1e06, 0, -3906.25)
     assert expected_sr in dsro.GetProjectionRef()
     dsro = None
-    free(p)
 
 
 ###############################################################################
 # Test creating a MEM dataset with the "MEM:::" name
 
 
-def test_mem_3():
+def test_mem_3(mem_drv):
 
-    drv = gdal.GetDriverByName("MEM")
-    ds = drv.Create("MEM:::", 1, 1, 1)
+    ds = mem_drv.Create("MEM:::", 1, 1, 1)
     assert ds is not None
     ds = None
 
@@ -239,11 +272,9 @@ def test_mem_3():
 # Test creating a band interleaved multi-band MEM dataset
 
 
-def test_mem_4():
-
-    drv = gdal.GetDriverByName("MEM")
+def test_mem_4(mem_drv):
 
-    ds = drv.Create("", 100, 100, 3)
+    ds = mem_drv.Create("", 100, 100, 3)
     expected_cs = [0, 0, 0]
     for i in range(3):
         cs = ds.GetRasterBand(i + 1).Checksum()
@@ -266,11 +297,9 @@ def test_mem_4():
 # Test creating a pixel interleaved multi-band MEM dataset
 
 
-def test_mem_5():
+def test_mem_5(mem_drv):
 
-    drv = gdal.GetDriverByName("MEM")
-
-    ds = drv.Create("", 100, 100, 3, options=["INTERLEAVE=PIXEL"])
+    ds = mem_drv.Create("", 100, 100, 3, options=["INTERLEAVE=PIXEL"])
     expected_cs = [0, 0, 0]
     for i in range(3):
         cs = ds.GetRasterBand(i + 1).Checksum()
@@ -297,51 +326,77 @@ def test_mem_5():
 # Test out-of-memory situations
 
 
+def _check_create_fails(
+    drv,
+    xsize,
+    ysize,
+    nbands,
+    datatype=gdal.GDT_Byte,
+    options=None,
+    expected_msg=None,
+):
+
+    ds = drv.Create("", xsize, ysize, nbands, datatype, options=options or [])
+    assert ds is None
+
+    if expected_msg is not None:
+        assert gdal.GetLastErrorMsg() == expected_msg
+
+
 @gdaltest.disable_exceptions()
-def test_mem_6():
+def test_mem_6(mem_drv):
 
     if gdal.GetConfigOption("SKIP_MEM_INTENSIVE_TEST") is not None:
         pytest.skip()
 
-    drv = gdal.GetDriverByName("MEM")
-
-    # Multiplication overflow
+    # All the below Create() calls are expected to fail
     with gdal.quiet_errors():
-        ds = drv.Create("", 1, 1, 0x7FFFFFFF, gdal.GDT_Float64)
-    assert ds is None
-    ds = None
+        _check_create_fails(
+            mem_drv,
+            1,
+            1,
+            0x7FFFFFFF,
+            gdal.GDT_Float64,
+            expected_msg="Multiplication overflow",
+        )
 
-    # Multiplication overflow
-    with gdal.quiet_errors():
-        ds = drv.Create("", 0x7FFFFFFF, 0x7FFFFFFF, 16)
-    assert ds is None
-    ds = None
+        _check_create_fails(
+            mem_drv,
+            0x7FFFFFFF,
+            0x7FFFFFFF,
+            16,
+            expected_msg="Multiplication overflow",
+        )
 
-    # Multiplication overflow
-    with gdal.quiet_errors():
-        ds = drv.Create("", 0x7FFFFFFF, 0x7FFFFFFF, 1, gdal.GDT_Float64)
-    assert ds is None
-    ds = None
+        _check_create_fails(
+            mem_drv,
+            0x7FFFFFFF,
+            0x7FFFFFFF,
+            1,
+            gdal.GDT_Float64,
+            expected_msg="Multiplication overflow",
+        )
 
-    # Out of memory error
-    with gdal.quiet_errors():
-        ds = drv.Create("", 0x7FFFFFFF, 0x7FFFFFFF, 1, options=["INTERLEAVE=PIXEL"])
-    assert ds is None
-    ds = None
+        # Out of memory error
+        _check_create_fails(
+            mem_drv, 0x7FFFFFFF, 0x7FFFFFFF, 1, options=["INTERLEAVE=PIXEL"]
+        )
 
-    # Out of memory error
-    with gdal.quiet_errors():
-        ds = drv.Create("", 0x7FFFFFFF, 0x7FFFFFFF, 1)
-    assert ds is None
-    ds = None
+        # Out of memory error
+        _check_create_fails(mem_drv, 0x7FFFFFFF, 0x7FFFFFFF, 1)
 
+    # Creating a 0-band dataset allocates nothing, and must succeed
+    ds = mem_drv.Create("", 0x7FFFFFFF, 1, 0)
+    assert ds is not None
     # 32 bit overflow on 32-bit builds, or possible out of memory error
-    ds = drv.Create("", 0x7FFFFFFF, 1, 0)
     with gdal.quiet_errors():
         ds.AddBand(gdal.GDT_Float64)
+    # Release the band data right away if the allocation succeeded
+    ds = None
 
+    ds = mem_drv.Create("", 0x7FFFFFFF, 0x7FFFFFFF, 0)
+    assert ds is not None
     # Will raise out of memory error in all cases
-    ds = drv.Create("", 0x7FFFFFFF, 0x7FFFFFFF, 0)
     with gdal.quiet_errors():
         ret = ds.AddBand(gdal.GDT_Float64)
     assert ret != 0
@@ -351,10 +406,9 @@ def test_mem_6():
 # Test AddBand()
 
 
-def test_mem_7():
+def test_mem_7(mem_drv):
 
-    drv = gdal.GetDriverByName("MEM")
-    ds = drv.Create("MEM:::", 1, 1, 1)
+    ds = mem_drv.Create("MEM:::", 1, 1, 1)
     ds.AddBand(gdal.GDT_Byte, [])
     assert ds.RasterCount == 2
     ds = None
@@ -364,10 +418,9 @@ def test_mem_7():
 # Test SetDefaultHistogram() / GetDefaultHistogram()
 
 
-def test_mem_8():
+def test_mem_8(mem_drv):
 
-    drv = gdal.GetDriverByName("MEM")
-    ds = drv.Create("MEM:::", 1, 1, 1)
+    ds = mem_drv.Create("MEM:::", 1, 1, 1)
     ds.GetRasterBand(1).SetDefaultHistogram(0, 255, [])
     ds.GetRasterBand(1).SetDefaultHistogram(1, 2, [5, 6])
     ds.GetRasterBand(1).SetDefaultHistogram(1, 2, [3000000000, 4])
@@ -381,136 +434,138 @@ def test_mem_8():
 # Test RasterIO()
 
 
-def test_mem_9():
+@pytest.mark.parametrize("interleave", ["BAND", "PIXEL"])
+def test_mem_9(mem_drv, rgbsmall_tif, interleave):
 
     # Test IRasterIO(GF_Read,)
-    src_ds = gdal.Open("data/rgbsmall.tif")
-    drv = gdal.GetDriverByName("MEM")
-
-    for interleave in ["BAND", "PIXEL"]:
-        out_ds = drv.CreateCopy("", src_ds, options=["INTERLEAVE=%s" % interleave])
-        ref_data = src_ds.GetRasterBand(2).ReadRaster(20, 8, 4, 5)
-        got_data = out_ds.GetRasterBand(2).ReadRaster(20, 8, 4, 5)
-        if ref_data != got_data:
-            import struct
-
-            print(struct.unpack("B" * 4 * 5, ref_data))
-            print(struct.unpack("B" * 4 * 5, got_data))
-            pytest.fail(interleave)
-
-        ref_data = src_ds.GetRasterBand(2).ReadRaster(
-            20, 8, 4, 5, buf_pixel_space=3, buf_line_space=100
-        )
-        got_data = out_ds.GetRasterBand(2).ReadRaster(
-            20, 8, 4, 5, buf_pixel_space=3, buf_line_space=100
-        )
-        assert ref_data == got_data, interleave
+    src_ds = rgbsmall_tif
+    out_ds = mem_drv.CreateCopy("", src_ds, options=["INTERLEAVE=%s" % interleave])
+
+    ref_data = src_ds.GetRasterBand(2).ReadRaster(20, 8, 4, 5)
+    got_data = out_ds.GetRasterBand(2).ReadRaster(20, 8, 4, 5)
+    if ref_data != got_data:
+        print(list(ref_data))
+        print(list(got_data))
+        pytest.fail(interleave)
+
+    ref_data = src_ds.GetRasterBand(2).ReadRaster(
+        20, 8, 4, 5, buf_pixel_space=3, buf_line_space=100
+    )
+    got_data = out_ds.GetRasterBand(2).ReadRaster(
+        20, 8, 4, 5, buf_pixel_space=3, buf_line_space=100
+    )
+    assert ref_data == got_data, interleave
 
-        ref_data = src_ds.ReadRaster(20, 8, 4, 5)
-        got_data = out_ds.ReadRaster(20, 8, 4, 5)
-        assert ref_data == got_data, interleave
+    ref_data = src_ds.ReadRaster(20, 8, 4, 5)
+    got_data = out_ds.ReadRaster(20, 8, 4, 5)
+    assert ref_data == got_data, interleave
 
-        ref_data = src_ds.ReadRaster(20, 8, 4, 5, buf_pixel_space=3, buf_band_space=1)
-        got_data = out_ds.ReadRaster(20, 8, 4, 5, buf_pixel_space=3, buf_band_space=1)
-        assert ref_data == got_data, interleave
+    ref_data = src_ds.ReadRaster(20, 8, 4, 5, buf_pixel_space=3, buf_band_space=1)
+    got_data = out_ds.ReadRaster(20, 8, 4, 5, buf_pixel_space=3, buf_band_space=1)
+    assert ref_data == got_data, interleave
 
-        out_ds.WriteRaster(20, 8, 4, 5, got_data, buf_pixel_space=3, buf_band_space=1)
-        got_data = out_ds.ReadRaster(20, 8, 4, 5, buf_pixel_space=3, buf_band_space=1)
-        assert ref_data == got_data, interleave
+    out_ds.WriteRaster(20, 8, 4, 5, got_data, buf_pixel_space=3, buf_band_space=1)
+    got_data = out_ds.ReadRaster(20, 8, 4, 5, buf_pixel_space=3, buf_band_space=1)
+    assert ref_data == got_data, interleave
 
-        ref_data = src_ds.ReadRaster(
-            20, 8, 4, 5, buf_pixel_space=3, buf_line_space=100, buf_band_space=1
-        )
-        got_data = out_ds.ReadRaster(
-            20, 8, 4, 5, buf_pixel_space=3, buf_line_space=100, buf_band_space=1
-        )
-        assert ref_data == got_data, interleave
+    ref_data = src_ds.ReadRaster(
+        20, 8, 4, 5, buf_pixel_space=3, buf_line_space=100, buf_band_space=1
+    )
+    got_data = out_ds.ReadRaster(
+        20, 8, 4, 5, buf_pixel_space=3, buf_line_space=100, buf_band_space=1
+    )
+    assert ref_data == got_data, interleave
 
-        ref_data = src_ds.ReadRaster(
-            20, 20, 4, 5, buf_type=gdal.GDT_Int32, buf_pixel_space=12, buf_band_space=4
-        )
-        got_data = out_ds.ReadRaster(
-            20, 20, 4, 5, buf_type=gdal.GDT_Int32, buf_pixel_space=12, buf_band_space=4
-        )
-        assert ref_data == got_data, interleave
-        out_ds.WriteRaster(
-            20,
-            20,
-            4,
-            5,
-            got_data,
-            buf_type=gdal.GDT_Int32,
-            buf_pixel_space=12,
-            buf_band_space=4,
-        )
-        got_data = out_ds.ReadRaster(
-            20, 20, 4, 5, buf_type=gdal.GDT_Int32, buf_pixel_space=12, buf_band_space=4
-        )
-        assert ref_data == got_data, interleave
-
-        # Test IReadBlock
-        ref_data = src_ds.GetRasterBand(1).ReadRaster(0, 10, src_ds.RasterXSize, 1)
-        # This is a bit nasty to have to do that. We should fix the core
-        # to make that unnecessary
-        out_ds.FlushCache()
-        got_data = out_ds.GetRasterBand(1).ReadBlock(0, 10)
-        assert ref_data == got_data, interleave
-
-        # Test IRasterIO(GF_Write,)
-        ref_data = src_ds.GetRasterBand(1).ReadRaster(2, 3, 4, 5)
-        out_ds.GetRasterBand(1).WriteRaster(6, 7, 4, 5, ref_data)
-        got_data = out_ds.GetRasterBand(1).ReadRaster(6, 7, 4, 5)
-        assert ref_data == got_data
-
-        # Test IRasterIO(GF_Write, change data type) + IWriteBlock() + IRasterIO(GF_Read, change data type)
-        ref_data = src_ds.GetRasterBand(1).ReadRaster(
-            10, 11, 4, 5, buf_type=gdal.GDT_Int32
-        )
-        out_ds.GetRasterBand(1).WriteRaster(
-            10, 11, 4, 5, ref_data, buf_type=gdal.GDT_Int32
-        )
-        got_data = out_ds.GetRasterBand(1).ReadRaster(
-            10, 11, 4, 5, buf_type=gdal.GDT_Int32
-        )
-        assert ref_data == got_data, interleave
-
-        ref_data = src_ds.GetRasterBand(1).ReadRaster(10, 11, 4, 5)
-        got_data = out_ds.GetRasterBand(1).ReadRaster(10, 11, 4, 5)
-        assert ref_data == got_data, interleave
-
-        # Test IRasterIO(GF_Write, resampling) + IWriteBlock() + IRasterIO(GF_Read, resampling)
-        ref_data = src_ds.GetRasterBand(1).ReadRaster(10, 11, 4, 5)
-        ref_data_zoomed = src_ds.GetRasterBand(1).ReadRaster(10, 11, 4, 5, 8, 10)
-        out_ds.GetRasterBand(1).WriteRaster(10, 11, 8, 10, ref_data, 4, 5)
-        got_data = out_ds.GetRasterBand(1).ReadRaster(10, 11, 8, 10)
-        assert ref_data_zoomed == got_data, interleave
-
-        got_data = out_ds.GetRasterBand(1).ReadRaster(10, 11, 8, 10, 4, 5)
-        assert ref_data == got_data, interleave
-
-    for interleave in ["BAND", "PIXEL"]:
-        out_ds = drv.CreateCopy("", src_ds, options=["INTERLEAVE=%s" % interleave])
-        for i in range(3):
-            out_ds.GetRasterBand(i + 1).Fill(0)
-        ref_data = src_ds.ReadRaster(
-            0, 10, out_ds.RasterXSize, 5, buf_pixel_space=3, buf_band_space=1
-        )
-        out_ds.WriteRaster(
-            0, 10, out_ds.RasterXSize, 5, ref_data, buf_pixel_space=3, buf_band_space=1
-        )
-        got_data = out_ds.ReadRaster(
-            0, 10, out_ds.RasterXSize, 5, buf_pixel_space=3, buf_band_space=1
-        )
-        assert ref_data == got_data, interleave
+    ref_data = src_ds.ReadRaster(
+        20, 20, 4, 5, buf_type=gdal.GDT_Int32, buf_pixel_space=12, buf_band_space=4
+    )
+    got_data = out_ds.ReadRaster(
+        20, 20, 4, 5, buf_type=gdal.GDT_Int32, buf_pixel_space=12, buf_band_space=4
+    )
+    assert ref_data == got_data, interleave
+    out_ds.WriteRaster(
+        20,
+        20,
+        4,
+        5,
+        got_data,
+        buf_type=gdal.GDT_Int32,
+        buf_pixel_space=12,
+        buf_band_space=4,
+    )
+    got_data = out_ds.ReadRaster(
+        20, 20, 4, 5, buf_type=gdal.GDT_Int32, buf_pixel_space=12, buf_band_space=4
+    )
+    assert ref_data == got_data, interleave
+
+    # Test IReadBlock
+    ref_data = src_ds.GetRasterBand(1).ReadRaster(0, 10, src_ds.RasterXSize, 1)
+    # This is a bit nasty to have to do that. We should fix the core
+    # to make that unnecessary
+    out_ds.FlushCache()
+    got_data = out_ds.GetRasterBand(1).ReadBlock(0, 10)
+    assert ref_data == got_data, interleave
+
+    # Test IRasterIO(GF_Write,)
+    ref_data = src_ds.GetRasterBand(1).ReadRaster(2, 3, 4, 5)
+    out_ds.GetRasterBand(1).WriteRaster(6, 7, 4, 5, ref_data)
+    got_data = out_ds.GetRasterBand(1).ReadRaster(6, 7, 4, 5)
+    assert ref_data == got_data
+
+    # Test IRasterIO(GF_Write, change data type) + IWriteBlock() + IRasterIO(GF_Read, change data type)
+    ref_data = src_ds.GetRasterBand(1).ReadRaster(10, 11, 4, 5, buf_type=gdal.GDT_Int32)
+    out_ds.GetRasterBand(1).WriteRaster(10, 11, 4, 5, ref_data, buf_type=gdal.GDT_Int32)
+    got_data = out_ds.GetRasterBand(1).ReadRaster(10, 11, 4, 5, buf_type=gdal.GDT_Int32)
+    assert ref_data == got_data, interleave
+
+    ref_data = src_ds.GetRasterBand(1).ReadRaster(10, 11, 4, 5)
+    got_data = out_ds.GetRasterBand(1).ReadRaster(10, 11, 4, 5)
+    assert ref_data == got_data, interleave
+
+    # Test IRasterIO(GF_Write, resampling) + IWriteBlock() + IRasterIO(GF_Read, resampling)
+    ref_data = src_ds.GetRasterBand(1).ReadRaster(10, 11, 4, 5)
+    ref_data_zoomed = src_ds.GetRasterBand(1).ReadRaster(10, 11, 4, 5, 8, 10)
+    out_ds.GetRasterBand(1).WriteRaster(10, 11, 8, 10, ref_data, 4, 5)
+    got_data = out_ds.GetRasterBand(1).ReadRaster(10, 11, 8, 10)
+    assert ref_data_zoomed == got_data, interleave
+
+    got_data = out_ds.GetRasterBand(1).ReadRaster(10, 11, 8, 10, 4, 5)
+    assert ref_data == got_data, interleave
 
-    for interleave in ["BAND", "PIXEL"]:
-        out_ds = drv.CreateCopy("", src_ds, options=["INTERLEAVE=%s" % interleave])
-        for i in range(3):
-            out_ds.GetRasterBand(i + 1).Fill(0)
-        ref_data = src_ds.ReadRaster(4, 10, 15, 5, buf_pixel_space=3, buf_band_space=1)
-        out_ds.WriteRaster(4, 10, 15, 5, ref_data, buf_pixel_space=3, buf_band_space=1)
-        got_data = out_ds.ReadRaster(4, 10, 15, 5, buf_pixel_space=3, buf_band_space=1)
-        assert ref_data == got_data, interleave
+
+###############################################################################
+# Test pixel-interleaved dataset RasterIO() round-trips
+
+
+# A xsize of None stands for the whole raster width
+@pytest.mark.parametrize(
+    "window", [(0, 10, None, 5), (4, 10, 15, 5)], ids=["lines", "window"]
+)
+@pytest.mark.parametrize("interleave", ["BAND", "PIXEL"])
+def test_mem_9_pixel_interleaved(mem_drv, rgbsmall_tif, interleave, window):
+
+    src_ds = rgbsmall_tif
+    out_ds = mem_drv.Create(
+        "",
+        src_ds.RasterXSize,
+        src_ds.RasterYSize,
+        src_ds.RasterCount,
+        options=["INTERLEAVE=%s" % interleave],
+    )
+    xoff, yoff, xsize, ysize = window
+    if xsize is None:
+        xsize = out_ds.RasterXSize
+
+    ref_data = src_ds.ReadRaster(
+        xoff, yoff, xsize, ysize, buf_pixel_space=3, buf_band_space=1
+    )
+    out_ds.WriteRaster(
+        xoff, yoff, xsize, ysize, ref_data, buf_pixel_space=3, buf_band_space=1
+    )
+    got_data = out_ds.ReadRaster(
+        xoff, yoff, xsize, ysize, buf_pixel_space=3, buf_band_space=1
+    )
+    assert ref_data == got_data
 
 
 ###############################################################################
@@ -518,21 +573,21 @@ def test_mem_9():
 
 
 @gdaltest.disable_exceptions()
-def test_mem_10():
+def test_mem_10(mem_drv, byte_tif, rgbsmall_tif):
 
     # Error case: building overview on a 0 band dataset
-    ds = gdal.GetDriverByName("MEM").Create("", 1, 1, 0)
+    ds = mem_drv.Create("", 1, 1, 0)
     with gdal.quiet_errors():
         ds.BuildOverviews("NEAR", [2])
 
     # Requesting overviews when they are not
-    ds = gdal.GetDriverByName("MEM").Create("", 1, 1)
+    ds = mem_drv.Create("", 1, 1)
     assert ds.GetRasterBand(1).GetOverviewCount() == 0
     assert ds.GetRasterBand(1).GetOverview(-1) is None
     assert ds.GetRasterBand(1).GetOverview(0) is None
 
     # Single band case
-    ds = gdal.GetDriverByName("MEM").CreateCopy("", gdal.Open("data/byte.tif"))
+    ds = mem_drv.CreateCopy("", byte_tif)
     for _ in range(2):
         ret = ds.BuildOverviews("NEAR", [2])
         assert ret == 0
@@ -583,7 +638,7 @@ def test_mem_10():
     ds = None
 
     # Multiple band case
-    ds = gdal.GetDriverByName("MEM").CreateCopy("", gdal.Open("data/rgbsmall.tif"))
+    ds = mem_drv.CreateCopy("", rgbsmall_tif)
     ret = ds.BuildOverviews("NEAR", [2])
     assert ret == 0
     cs = ds.GetRasterBand(1).GetOverview(0).Checksum()
@@ -595,7 +650,7 @@ def test_mem_10():
     ds = None
 
     # Clean overviews
-    ds = gdal.GetDriverByName("MEM").CreateCopy("", gdal.Open("data/byte.tif"))
+    ds = mem_drv.CreateCopy("", byte_tif)
     ret = ds.BuildOverviews("NEAR", [2])
     assert ret == 0
     ret = ds.BuildOverviews("NONE", [])
@@ -608,14 +663,14 @@ def test_mem_10():
 # Test CreateMaskBand()
 
 
-def test_mem_11():
+def test_mem_11(mem_drv):
 
     # Error case: building overview on a 0 band dataset
-    ds = gdal.GetDriverByName("MEM").Create("", 1, 1, 0)
+    ds = mem_drv.Create("", 1, 1, 0)
     assert ds.CreateMaskBand(gdal.GMF_PER_DATASET) != 0
 
     # Per dataset mask on single band dataset
-    ds = gdal.GetDriverByName("MEM").Create("", 1, 1)
+    ds = mem_drv.Create("", 1, 1)
     assert ds.CreateMaskBand(gdal.GMF_PER_DATASET) == 0
     assert ds.GetRasterBand(1).GetMaskFlags() == gdal.GMF_PER_DATASET
     assert not ds.GetRasterBand(1).IsMaskBand()
@@ -628,7 +683,7 @@ def test_mem_11():
     assert cs == 3
 
     # Check that the per dataset mask is shared by all bands
-    ds = gdal.GetDriverByName("MEM").Create("", 1, 1, 2)
+    ds = mem_drv.Create("", 1, 1, 2)
     assert ds.CreateMaskBand(gdal.GMF_PER_DATASET) == 0
     mask1 = ds.GetRasterBand(1).GetMaskBand()
     mask1.Fill(255)
@@ -637,7 +692,7 @@ def test_mem_11():
     assert cs == 3
 
     # Same but call it on band 2
-    ds = gdal.GetDriverByName("MEM").Create("", 1, 1, 2)
+    ds = mem_drv.Create("", 1, 1, 2)
     assert ds.GetRasterBand(2).CreateMaskBand(gdal.GMF_PER_DATASET) == 0
     mask2 = ds.GetRasterBand(2).GetMaskBand()
     mask2.Fill(255)
@@ -646,7 +701,7 @@ def test_mem_11():
     assert cs == 3
 
     # Per band masks
-    ds = gdal.GetDriverByName("MEM").Create("", 1, 1, 2)
+    ds = mem_drv.Create("", 1, 1, 2)
     assert ds.GetRasterBand(1).CreateMaskBand(0) == 0
     assert ds.GetRasterBand(2).CreateMaskBand(0) == 0
     mask1 = ds.GetRasterBand(1).GetMaskBand()
@@ -661,39 +716,43 @@ def test_mem_11():
 # Test CreateMaskBand() and overviews.
 
 
-def test_mem_12():
+# Checksums of the 5x5 overview of a 10x10 mask filled with 127, and of the
+# one of a default (all valid) mask
+_OVR_FILLED_MASK_CS = 267
+_OVR_DEFAULT_MASK_CS = 283
 
-    # Test on per-band mask
-    ds = gdal.GetDriverByName("MEM").Create("", 10, 10, 2)
-    ds.GetRasterBand(1).CreateMaskBand(0)
-    ds.GetRasterBand(1).GetMaskBand().Fill(127)
-    ds.BuildOverviews("NEAR", [2])
-    cs = ds.GetRasterBand(1).GetOverview(0).GetMaskBand().Checksum()
-    assert cs == 267
 
-    # Default mask
-    cs = ds.GetRasterBand(2).GetOverview(0).GetMaskBand().Checksum()
-    assert cs == 283
+@pytest.mark.parametrize(
+    "mask_flags", [0, gdal.GMF_PER_DATASET], ids=["per_band", "per_dataset"]
+)
+def test_mem_12(mem_drv, mask_flags):
 
-    # Test on per-dataset mask
-    ds = gdal.GetDriverByName("MEM").Create("", 10, 10, 2)
-    ds.CreateMaskBand(gdal.GMF_PER_DATASET)
+    ds = mem_drv.Create("", 10, 10, 2)
+    if mask_flags == gdal.GMF_PER_DATASET:
+        ds.CreateMaskBand(gdal.GMF_PER_DATASET)
+    else:
+        ds.GetRasterBand(1).CreateMaskBand(mask_flags)
     ds.GetRasterBand(1).GetMaskBand().Fill(127)
     ds.BuildOverviews("NEAR", [2])
     cs = ds.GetRasterBand(1).GetOverview(0).GetMaskBand().Checksum()
-    assert cs == 267
+    assert cs == _OVR_FILLED_MASK_CS
+
+    # Default mask for a per-band mask, shared one otherwise
     cs2 = ds.GetRasterBand(2).GetOverview(0).GetMaskBand().Checksum()
-    assert cs2 == cs
+    if mask_flags == gdal.GMF_PER_DATASET:
+        assert cs2 == _OVR_FILLED_MASK_CS
+    else:
+        assert cs2 == _OVR_DEFAULT_MASK_CS
 
 
 ###############################################################################
 # Check RAT support
 
 
-def test_mem_rat():
+def test_mem_rat(mem_drv):
 
-    ds = gdal.GetDriverByName("MEM").Create("", 1, 1)
-    ds.GetRasterBand(1).SetDefaultRAT(gdal.RasterAttributeTable())
+    ds = mem_drv.Create("", 1, 1)
+    ds.GetRasterBand(1).SetDefaultRAT(_RAT)
     assert ds.GetRasterBand(1).GetDefaultRAT() is not None
     ds.GetRasterBand(1).SetDefaultRAT(None)
     assert ds.GetRasterBand(1).GetDefaultRAT() is None
@@ -703,9 +762,9 @@ def test_mem_rat():
 # Check CategoryNames support
 
 
-def test_mem_categorynames():
+def test_mem_categorynames(mem_drv):
 
-    ds = gdal.GetDriverByName("MEM").Create("", 1, 1)
+    ds = mem_drv.Create("", 1, 1)
     ds.GetRasterBand(1).SetCategoryNames(["foo"])
     assert ds.GetRasterBand(1).GetCategoryNames() == ["foo"]
     ds.GetRasterBand(1).SetCategoryNames([])
@@ -716,12 +775,10 @@ def test_mem_categorynames():
 # Check ColorTable support
 
 
-def test_mem_colortable():
+def test_mem_colortable(mem_drv):
 
-    ds = gdal.GetDriverByName("MEM").Create("", 1, 1)
-    ct = gdal.ColorTable()
-    ct.SetColorEntry(0, (255, 255, 255, 255))
-    ds.GetRasterBand(1).SetColorTable(ct)
+    ds = mem_drv.Create("", 1, 1)
+    ds.GetRasterBand(1).SetColorTable(_CT)
     assert ds.GetRasterBand(1).GetColorTable().GetCount() == 1
     ds.GetRasterBand(1).SetColorTable(None)
     assert ds.GetRasterBand(1).GetColorTable() is None
@@ -731,19 +788,17 @@ def test_mem_colortable():
 # Test dataset RasterIO with non nearest resampling
 
 
-def test_mem_dataset_rasterio_non_nearest_resampling_source_with_ovr():
+def test_mem_dataset_rasterio_non_nearest_resampling_source_with_ovr(mem_drv):
 
-    ds = gdal.GetDriverByName("MEM").Create("", 10, 10, 3)
+    ds = mem_drv.Create("", 10, 10, 3)
     ds.GetRasterBand(1).Fill(255)
     ds.BuildOverviews("NONE", [2])
     ds.GetRasterBand(1).GetOverview(0).Fill(10)
 
     got_data = ds.ReadRaster(0, 0, 10, 10, 5, 5)
-    got_data = struct.unpack("B" * 5 * 5 * 3, got_data)
     assert got_data[0] == 10
 
     got_data = ds.ReadRaster(0, 0, 10, 10, 5, 5, resample_alg=gdal.GRIORA_Cubic)
-    got_data = struct.unpack("B" * 5 * 5 * 3, got_data)
     assert got_data[0] == 10
 
 
@@ -751,9 +806,9 @@ def test_mem_dataset_rasterio_non_nearest_resampling_source_with_ovr():
 # Test Int64 nodata
 
 
-def test_mem_nodata_int64():
+def test_mem_nodata_int64(mem_drv):
 
-    ds = gdal.GetDriverByName("MEM").Create("", 1, 1, 1, gdal.GDT_Int64)
+    ds = mem_drv.Create("", 1, 1, 1, gdal.GDT_Int64)
     val = -(1 << 63)
     assert ds.GetRasterBand(1).SetNoDataValue(val) == gdal.CE_None
     assert ds.GetRasterBand(1).GetNoDataValue() == val
@@ -763,9 +818,9 @@ def test_mem_nodata_int64():
 # Test UInt64 nodata
 
 
-def test_mem_nodata_uint64():
+def test_mem_nodata_uint64(mem_drv):
 
-    ds = gdal.GetDriverByName("MEM").Create("", 1, 1, 1, gdal.GDT_UInt64)
+    ds = mem_drv.Create("", 1, 1, 1, gdal.GDT_UInt64)
     val = (1 << 64) - 1
     assert ds.GetRasterBand(1).SetNoDataValue(val) == gdal.CE_None
     assert ds.GetRasterBand(1).GetNoDataValue() == val
@@ -775,9 +830,9 @@ def test_mem_nodata_uint64():
 # Check IsMaskBand() on an alpha band
 
 
-def test_mem_alpha_ismaskband():
+def test_mem_alpha_ismaskband(mem_drv):
 
-    ds = gdal.GetDriverByName("MEM").Create("", 1, 1, 2)
+    ds = mem_drv.Create("", 1, 1, 2)
     ds.GetRasterBand(2).SetColorInterpretation(gdal.GCI_AlphaBand)
     assert not ds.GetRasterBand(1).IsMaskBand()
     assert ds.GetRasterBand(2).IsMaskBand()
@@ -41,6 +41,19 @@ from osgeo import gdal, ogr, osr
 
 pytestmark = pytest.mark.require_driver("MiraMonVector")
 
+
+@pytest.fixture(scope="module")
+def miramon_drv():
+    return ogr.GetDriverByName("MiramonVector")
+
+
+@pytest.fixture(scope="module")
+def srs_32631():
+    srs = osr.SpatialReference()
+    srs.ImportFromEPSG(32631)
+    return srs
+
+
 ###############################################################################
 # basic point test
 
@@ -1038,13 +1051,11 @@ def open_ds_lyr_0_feature_0(layername):
     return ds, lyr, f
 
 
-def test_ogr_miramon_write_basic_polygon(tmp_path):
+def test_ogr_miramon_write_basic_polygon(tmp_path, srs_32631, miramon_drv):
 
     filename = str(tmp_path / "DataSetPOL")
-    ds = ogr.GetDriverByName("MiramonVector").CreateDataSource(filename)
-    srs = osr.SpatialReference()
-    srs.ImportFromEPSG(32631)
-    lyr = ds.CreateLayer("test", srs=srs, geom_type=ogr.wkbUnknown)
+    ds = miramon_drv.CreateDataSource(filename)
+    lyr = ds.CreateLayer("test", srs=srs_32631, geom_type=ogr.wkbUnknown)
     create_common_attributes(lyr)
     f = ogr.Feature(lyr.GetLayerDefn())
     assign_common_attributes(f)
@@ -1068,13 +1079,11 @@ def test_ogr_miramon_write_basic_polygon(tmp_path):
     ds = None
 
 
-def test_ogr_miramon_write_basic_multipolygon(tmp_path):
+def test_ogr_miramon_write_basic_multipolygon(tmp_path, srs_32631, miramon_drv):
 
     filename = str(tmp_path / "DataSetMULTIPOL")
-    ds = ogr.GetDriverByName("MiramonVector").CreateDataSource(filename)
-    srs = osr.SpatialReference()
-    srs.ImportFromEPSG(32631)
-    lyr = ds.CreateLayer("test", srs=srs, geom_type=ogr.wkbUnknown)
+    ds = miramon_drv.CreateDataSource(filename)
+    lyr = ds.CreateLayer("test", srs=srs_32631, geom_type=ogr.wkbUnknown)
     create_common_attributes(lyr)
     f = ogr.Feature(lyr.GetLayerDefn())
     assign_common_attributes(f)
@@ -1106,13 +1115,11 @@ def test_ogr_miramon_write_basic_multipolygon(tmp_path):
     ds = None
 
 
-def test_ogr_miramon_write_basic_multipolygon_3d(tmp_path):
+def test_ogr_miramon_write_basic_multipolygon_3d(tmp_path, srs_32631, miramon_drv):
 
     filename = str(tmp_path / "DataSetMULTIPOL3d")
-    ds = ogr.GetDriverByName("MiramonVector").CreateDataSource(filename)
-    srs = osr.SpatialReference()
-    srs.ImportFromEPSG(32631)
-    lyr = ds.CreateLayer("test", srs=srs, geom_type=ogr.wkbUnknown)
+    ds = miramon_drv.CreateDataSource(filename)
+    lyr = ds.CreateLayer("test", srs=srs_32631, geom_type=ogr.wkbUnknown)
     create_common_attributes(lyr)
     f = ogr.Feature(lyr.GetLayerDefn())
     assign_common_attributes(f)
@@ -1144,13 +1151,11 @@ def test_ogr_miramon_write_basic_multipolygon_3d(tmp_path):
     ds = None
 
 
-def test_ogr_miramon_write_basic_linestring(tmp_path):
+def test_ogr_miramon_write_basic_linestring(tmp_path, srs_32631, miramon_drv):
 
     filename = str(tmp_path / "DataSetLINESTRING")
-    ds = ogr.GetDriverByName("MiramonVector").CreateDataSource(filename)
-    srs = osr.SpatialReference()
-    srs.ImportFromEPSG(32631)
-    lyr = ds.CreateLayer("test", srs=srs, geom_type=ogr.wkbUnknown)
+    ds = miramon_drv.CreateDataSource(filename)
+    lyr = ds.CreateLayer("test", srs=srs_32631, geom_type=ogr.wkbUnknown)
     create_common_attributes(lyr)
     f = ogr.Feature(lyr.GetLayerDefn())
     assign_common_attributes(f)
@@ -1182,13 +1187,13 @@ def test_ogr_miramon_write_basic_linestring(tmp_path):
         "LINESTRING Z (0 0 4,0 1 4,1 1 4)",
     ],
 )
-def test_ogr_miramon_write_basic_linestringZ(tmp_path, LinestringZ):
+def test_ogr_miramon_write_basic_linestringZ(
+    tmp_path, LinestringZ, srs_32631, miramon_drv
+):
 
     filename = str(tmp_path / "DataSetLINESTRING")
-    ds = ogr.GetDriverByName("MiramonVector").CreateDataSource(filename)
-    srs = osr.SpatialReference()
-    srs.ImportFromEPSG(32631)
-    lyr = ds.CreateLayer("test", srs=srs, geom_type=ogr.wkbUnknown)
+    ds = miramon_drv.CreateDataSource(filename)
+    lyr = ds.CreateLayer("test", srs=srs_32631, geom_type=ogr.wkbUnknown)
     create_common_attributes(lyr)
     f = ogr.Feature(lyr.GetLayerDefn())
     assign_common_attributes(f)
@@ -1211,13 +1216,11 @@ def test_ogr_miramon_write_basic_linestringZ(tmp_path, LinestringZ):
     ds = None
 
 
-def test_ogr_miramon_write_basic_multilinestring(tmp_path):
+def test_ogr_miramon_write_basic_multilinestring(tmp_path, srs_32631, miramon_drv):
 
     filename = str(tmp_path / "DataSetMULTILINESTRING")
-    ds = ogr.GetDriverByName("MiramonVector").CreateDataSource(filename)
-    srs = osr.SpatialReference()
-    srs.ImportFromEPSG(32631)
-    lyr = ds.CreateLayer("test", srs=srs, geom_type=ogr.wkbUnknown)
+    ds = miramon_drv.CreateDataSource(filename)
+    lyr = ds.CreateLayer("test", srs=srs_32631, geom_type=ogr.wkbUnknown)
     create_common_attributes(lyr)
     f = ogr.Feature(lyr.GetLayerDefn())
     assign_common_attributes(f)
@@ -1260,14 +1263,14 @@ def test_ogr_miramon_write_basic_multilinestring(tmp_path):
         "ANSI",
     ],
 )
-def test_ogr_miramon_write_basic_point(tmp_path, DBFEncoding):
+def test_ogr_miramon_write_basic_point(tmp_path, DBFEncoding, srs_32631, miramon_drv):
 
     filename = str(tmp_path / "DataSetPOINT")
-    ds = ogr.GetDriverByName("MiramonVector").CreateDataSource(filename)
-    srs = osr.SpatialReference()
-    srs.ImportFromEPSG(32631)
+    ds = miramon_drv.CreateDataSource(filename)
     options = ["DBFEncoding=" + DBFEncoding]
-    lyr = ds.CreateLayer("test", srs=srs, geom_type=ogr.wkbUnknown, options=options)
+    lyr = ds.CreateLayer(
+        "test", srs=srs_32631, geom_type=ogr.wkbUnknown, options=options
+    )
     create_common_attributes(lyr)
     f = ogr.Feature(lyr.GetLayerDefn())
     assign_common_attributes(f)
@@ -1297,13 +1300,11 @@ def test_ogr_miramon_write_basic_point(tmp_path, DBFEncoding):
     ds = None
 
 
-def test_ogr_miramon_write_basic_pointZ(tmp_path):
+def test_ogr_miramon_write_basic_pointZ(tmp_path, srs_32631, miramon_drv):
 
     filename = str(tmp_path / "DataSetPOINT")
-    ds = ogr.GetDriverByName("MiramonVector").CreateDataSource(filename)
-    srs = osr.SpatialReference()
-    srs.ImportFromEPSG(32631)
-    lyr = ds.CreateLayer("test", srs=srs, geom_type=ogr.wkbUnknown)
+    ds = miramon_drv.CreateDataSource(filename)
+    lyr = ds.CreateLayer("test", srs=srs_32631, geom_type=ogr.wkbUnknown)
     create_common_attributes(lyr)
     f = ogr.Feature(lyr.GetLayerDefn())
     assign_common_attributes(f)
@@ -1333,13 +1334,11 @@ def test_ogr_miramon_write_basic_pointZ(tmp_path):
     ds = None
 
 
-def test_ogr_miramon_write_basic_multipoint(tmp_path):
+def test_ogr_miramon_write_basic_multipoint(tmp_path, srs_32631, miramon_drv):
 
     filename = str(tmp_path / "DataSetMULTIPOINT")
-    ds = ogr.GetDriverByName("MiramonVector").CreateDataSource(filename)
-    srs = osr.SpatialReference()
-    srs.ImportFromEPSG(32631)
-    lyr = ds.CreateLayer("test", srs=srs, geom_type=ogr.wkbUnknown)
+    ds = miramon_drv.CreateDataSource(filename)
+    lyr = ds.CreateLayer("test", srs=srs_32631, geom_type=ogr.wkbUnknown)
     create_common_attributes(lyr)
     f = ogr.Feature(lyr.GetLayerDefn())
     assign_common_attributes(f)
@@ -1366,13 +1365,11 @@ def test_ogr_miramon_write_basic_multipoint(tmp_path):
     ds = None
 
 
-def test_ogr_miramon_write_basic_multigeometry(tmp_path):
+def test_ogr_miramon_write_basic_multigeometry(tmp_path, srs_32631, miramon_drv):
 
     filename = str(tmp_path / "DataSetMULTIGEOM")
-    ds = ogr.GetDriverByName("MiramonVector").CreateDataSource(filename)
-    srs = osr.SpatialReference()
-    srs.ImportFromEPSG(32631)
-    lyr = ds.CreateLayer("test", srs=srs, geom_type=ogr.wkbUnknown)
+    ds = miramon_drv.CreateDataSource(filename)
+    lyr = ds.CreateLayer("test", srs=srs_32631, geom_type=ogr.wkbUnknown)
     create_common_attributes(lyr)
     f = ogr.Feature(lyr.GetLayerDefn())
     assign_common_attributes(f)
@@ -1424,13 +1421,11 @@ def test_ogr_miramon_write_basic_multigeometry(tmp_path):
     ds = None
 
 
-def test_ogr_miramon_create_field_after_feature(tmp_path):
+def test_ogr_miramon_create_field_after_feature(tmp_path, srs_32631, miramon_drv):
 
     filename = str(tmp_path / "DataSetMULTIPOINT")
-    ds = ogr.GetDriverByName("MiramonVector").CreateDataSource(filename)
-    srs = osr.SpatialReference()
-    srs.ImportFromEPSG(32631)
-    lyr = ds.CreateLayer("test", srs=srs, geom_type=ogr.wkbUnknown)
+    ds = miramon_drv.CreateDataSource(filename)
+    lyr = ds.CreateLayer("test", srs=srs_32631, geom_type=ogr.wkbUnknown)
     create_common_attributes(lyr)
     f = ogr.Feature(lyr.GetLayerDefn())
     assign_common_attributes(f)
@@ -7,6 +7,8 @@ from sphinx.transforms.post_transforms import SphinxPostTransform
 from sphinx.util import logging
 from sphinx.util.docutils import SphinxDirective
 
+logger = logging.getLogger(__name__)
+
 ### Utility functions
 
 
@@ -50,6 +52,19 @@ class Option:
     # Class to store properties of an option and where it was
     # defined.
 
+    __slots__ = (
+        "option_type",
+        "option_name",
+        "docname",
+        "lineno",
+        "required",
+        "since_ver",
+        "content_node",
+        "choices",
+        "default",
+        "para",
+    )
+
     def __init__(
         self,
         *,
@@ -123,10 +138,11 @@ class Option:
                         nodes.Text(f"{app.config.project} >= {self.since_ver}")
                     )
             except ValueError:
-                logger = logging.getLogger(__name__)
                 logger.warning(
-                    f"Option {self.option_name} :since: should be a sequence of integers and periods (got {self.since_ver})",
-                    location=self.env.docname,
+                    "Option %s :since: should be a sequence of integers and periods (got %s)",
+                    self.option_name,
+                    self.since_ver,
+                    location=(self.docname, self.lineno),
                 )
 
         if caveats:
@@ -171,18 +187,21 @@ def register_option(env, opt):
     if not hasattr(env, "gdal_options"):
         env.gdal_options = {}
 
-    orig_opt = env.gdal_options.get(opt.key(), None)
+    key = opt.key()
+    orig_opt = env.gdal_options.get(key)
     if orig_opt is not None and orig_opt != opt:
         # Ignore exact duplicates that may arise during parallel processing.
         # If the options differ in any way (docname, lineno, etc.)
         # then raise a warning.
-        logger = logging.getLogger(__name__)
         logger.warning(
-            f"Duplicate definition of {opt.option_name} (previously defined at {orig_opt.docname}:{orig_opt.lineno})",
+            "Duplicate definition of %s (previously defined at %s:%s)",
+            opt.option_name,
+            orig_opt.docname,
+            orig_opt.lineno,
             location=(opt.docname, opt.lineno),
         )
     else:
-        env.gdal_options[opt.key()] = opt
+        env.gdal_options[key] = opt
 
 
 ### Directives for declaring configuration options
@@ -201,26 +220,26 @@ class BaseConfigOption(SphinxDirective):
 
     def run(self):
         option_name = self.arguments[0]
-
-        if "required" in self.options:
-            if self.options["required"].upper() in {"TRUE", "YES"}:
+        options = self.options
+        docname = self.env.docname
+
+        required = False
+        required_value = options.get("required")
+        if required_value is not None:
+            required_value = required_value.upper()
+            if required_value in {"TRUE", "YES"}:
                 required = True
-            elif self.options["required"].upper() in {"FALSE", "NO"}:
-                required = False
-            else:
-                required = False
-                logger = logging.getLogger(__name__)
+            elif required_value not in {"FALSE", "NO"}:
                 logger.warning(
-                    f"Option {option_name} :required: should be YES or NO)",
-                    location=self.env.docname,
+                    "Option %s :required: should be YES or NO)",
+                    option_name,
+                    location=docname,
                 )
-        else:
-            required = False
 
         ref_key = option_key(
             option_type=self.opt_type,
             option_name=option_name,
-            docname=self.env.docname,
+            docname=docname,
         )
 
         target_node = nodes.target("", "", ids=[ref_key])
@@ -236,12 +255,12 @@ class BaseConfigOption(SphinxDirective):
         opt = Option(
             option_type=self.opt_type,
             option_name=option_name,
-            docname=self.env.docname,
+            docname=docname,
             lineno=self.lineno,
             required=required,
-            choices=self.options.get("choices", None),
-            default=self.options.get("default", None),
-            since_ver=self.options.get("since", None),
+            choices=options.get("choices"),
+            default=options.get("default"),
+            since_ver=options.get("since"),
             content_node=content_node,
         )
 
@@ -291,6 +310,9 @@ class config_definition(nodes.General, nodes.Element):
 
 
 def config_ref(opt_type, *, copy_definition=False):
+    # Attributes shared by every reference node this role emits.
+    xref_attributes = {"reftype": opt_type, "refdomain": "std"}
+
     def role(name, rawtext, text, lineno, inliner, options={}, content=[]):
         env = inliner.document.settings.env
 
@@ -313,16 +335,15 @@ def config_ref(opt_type, *, copy_definition=False):
 
         # Record the document from which this reference was
         # used. This lets us build a reverse index showing
-        # where each configuration option is used.
+        # where each configuration option is used. The documents
+        # are kept as the keys of a dict, which acts as an ordered
+        # set so repeated references from one page are stored once.
         if not hasattr(env, "gdal_option_refs"):
             env.gdal_option_refs = {}
 
         ref_key = option_key(option_type=opt_type, option_name=option, docname=docname)
 
-        if ref_key not in env.gdal_option_refs:
-            env.gdal_option_refs[ref_key] = []
-
-        env.gdal_option_refs[ref_key].append({"document": env.docname})
+        env.gdal_option_refs.setdefault(ref_key, {})[env.docname] = None
 
         # Emit a placeholder node that describes the config
         # option we're trying to reference. After all files
@@ -337,13 +358,7 @@ def config_ref(opt_type, *, copy_definition=False):
 
             return [opt_placeholder], []
         else:
-            ref_node = pending_xref(
-                "",
-                ref_text,
-                reftype=opt_type,
-                refdomain="std",
-                reftarget=ref_key,
-            )
+            ref_node = pending_xref("", ref_text, reftarget=ref_key, **xref_attributes)
 
             return [ref_node], []
 
@@ -356,28 +371,38 @@ def config_ref(opt_type, *, copy_definition=False):
 
 
 def purge_option_defs(app, env, docname):
-    if not hasattr(env, "gdal_options"):
+    options = getattr(env, "gdal_options", None)
+    if not options:
         return
 
-    env.gdal_options = {
-        k: v for k, v in env.gdal_options.items() if v.docname != docname
-    }
+    env.gdal_options = {k: v for k, v in options.items() if v.docname != docname}
 
 
 def purge_option_refs(app, env, docname):
-    if not hasattr(env, "gdal_option_refs"):
+    option_refs = getattr(env, "gdal_option_refs", None)
+    if not option_refs:
         return
 
-    for key in env.gdal_option_refs:
-        env.gdal_option_refs[key] = [
-            x for x in env.gdal_option_refs[key] if x["document"] != docname
-        ]
+    for refs in option_refs.values():
+        refs.pop(docname, None)
 
 
 def merge_option_defs(app, env, docnames, other):
-    if hasattr(other, "gdal_options"):
-        for opt in other.gdal_options.values():
-            register_option(env, opt)
+    other_options = getattr(other, "gdal_options", None)
+    if not other_options:
+        return
+
+    if not hasattr(env, "gdal_options"):
+        env.gdal_options = {}
+
+    # Options not yet known can be copied over in bulk; only keys
+    # present in both environments need the duplicate check.
+    conflicts = env.gdal_options.keys() & other_options.keys()
+    env.gdal_options.update(
+        (k, v) for k, v in other_options.items() if k not in conflicts
+    )
+    for k in conflicts:
+        register_option(env, other_options[k])
 
 
 def merge_option_refs(app, env, docnames, other):
@@ -385,10 +410,7 @@ def merge_option_refs(app, env, docnames, other):
         env.gdal_option_refs = {}
     if hasattr(other, "gdal_option_refs"):
         for k, v in other.gdal_option_refs.items():
-            if k in env.gdal_option_refs:
-                env.gdal_option_refs[k] += v
-            else:
-                env.gdal_option_refs[k] = v.copy()
+            env.gdal_option_refs.setdefault(k, {}).update(v)
 
 
 ### Code to support construction of a config option index
@@ -402,7 +424,7 @@ class ConfigIndex(SphinxDirective):
 
     def run(self):
         if "types" not in self.options:
-            types = set(option_classes.keys())
+            types = set(option_classes)
         else:
             types = {x.strip() for x in self.options["types"].split(",")}
 
@@ -435,6 +457,10 @@ def create_config_index(app, doctree, fromdocname):
     if not hasattr(env, "gdal_options"):
         env.gdal_options = {}
 
+    # Most documents reference several options, so look up
+    # each document title only once.
+    ref_titles = {}
+
     for node in doctree.findall(config_index):
         # Filter out the options that will be included
         # in this index.
@@ -447,11 +473,9 @@ def create_config_index(app, doctree, fromdocname):
         list_node = nodes.bullet_list()
 
         for opt in options:
-            refs = env.gdal_option_refs.get(opt.key(), [])
-
             # Include a link to the definition of
             # the option along with usages.
-            refs.append({"document": opt.docname})
+            refs = {**env.gdal_option_refs.get(opt.key(), {}), opt.docname: None}
 
             if refs:
                 para = nodes.paragraph()
@@ -473,7 +497,7 @@ def create_config_index(app, doctree, fromdocname):
 
                 # Create a link for each unique page referencing the option.
                 # TODO sort by document title instead of document name?
-                ref_docs = sorted({ref["document"] for ref in refs})
+                ref_docs = sorted(refs)
 
                 bullets_for_references = len(ref_docs) > 1
 
@@ -484,7 +508,10 @@ def create_config_index(app, doctree, fromdocname):
                     ref_node_parent = para
 
                 for ref_doc in ref_docs:
-                    ref_title = str(env.titles[ref_doc].children[0])
+                    ref_title = ref_titles.get(ref_doc)
+                    if ref_title is None:
+                        ref_title = str(env.titles[ref_doc].children[0])
+                        ref_titles[ref_doc] = ref_title
 
                     try:
                         ref_node = nodes.reference(
@@ -522,23 +549,23 @@ def link_option_refs(app, env, node, contnode):
     # This event handler is called on "missing-reference"
     # It resolves the pending_xrefs created by e.g.,
     # :config:`GDAL_CACHEMAX` into actual references.
-    if node["reftype"] not in option_classes.keys():
+    if node["reftype"] not in option_classes:
         return
 
-    # logger = logging.getLogger(__name__)
     # logger.info(
     #    f"Linking {node['reftarget']}",
     #    location=env.docname,
     # )
 
-    matched_opt = env.gdal_options.get(node["reftarget"], None)
+    matched_opt = getattr(env, "gdal_options", {}).get(node["reftarget"])
 
     if matched_opt is None:
-        logger = logging.getLogger(__name__)
         option_type, option_name = split_option_key(node["reftarget"])
 
         logger.warning(
-            f"Can't find option {option_name} of type {option_type}",
+            "Can't find option %s of type %s",
+            option_name,
+            option_type,
             location=node,
         )
 
@@ -577,9 +604,10 @@ class WriteOptionDefinitions(SphinxPostTransform):
             else:
                 option_type, option_name = split_option_key(node["key"])
 
-                logger = logging.getLogger(__name__)
                 logger.warning(
-                    f"Can't find option {option_name} of type {option_type}",
+                    "Can't find option %s of type %s",
+                    option_name,
+                    option_type,
                     location=node,
                 )
 
@@ -589,8 +617,6 @@ class WriteOptionDefinitions(SphinxPostTransform):
 def log_options(app, env):
     # This event handler is called on "env-updated"
 
-    logger = logging.getLogger(__name__)
-
     logger.info(
         f"Identified {len(env.gdal_options)} GDAL options with {len(env.gdal_option_refs)} references."
     )
@@ -634,4 +660,9 @@ def setup(app):
 
     app.connect("env-updated", log_options)
 
-    return {"version": "0.1", "parallel_read_safe": True, "parallel_write_safe": True}
+    return {
+        "version": "0.1",
+        "env_version": 2,
+        "parallel_read_safe": True,
+        "parallel_write_safe": True,
+    }